@@ -0,0 +1,42 @@
+"""stream listing indexes
+
+Revision ID: 4f2a9c1d7b3e
+Revises: 75346eea8c38
+Create Date: 2026-10-16 09:30:12.418207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa  # noqa F401
+
+from alembic import op  # noqa F401
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a9c1d7b3e"
+down_revision: Union[str, Sequence[str], None] = "75346eea8c38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_streams_user_created",
+        "streams",
+        ["user_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_streams_live_viewers",
+        "streams",
+        [sa.text("current_viewers DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_live AND NOT is_private"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_streams_live_viewers", table_name="streams")
+    op.drop_index("ix_streams_user_created", table_name="streams")
@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, cast
+from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 
 # from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
@@ -45,6 +46,12 @@ from app.utils.helper import get_user_identifier
 auth_crud = UserCRUD()
 auth_router = APIRouter(tags=["auth"])
 
+
+def get_auth_crud() -> UserCRUD:
+    """Provide the shared UserCRUD; tests swap it via dependency_overrides."""
+    return auth_crud
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
@@ -66,6 +73,7 @@ async def register_user(
     user_create: PublicUserCreate,
     backend_tasks: BackgroundTasks,
     session: Annotated[AsyncSession, Depends(get_session)],  # noqa: B008
+    crud: Annotated[UserCRUD, Depends(get_auth_crud)],  # noqa: B008
 ) -> UserRead:
     email = user_create.email
     username = user_create.username
@@ -74,14 +82,14 @@ async def register_user(
             message="Email and username are required.",
             details={"field": "email/username"},
         )
-    user_exists = await auth_crud.user_exists(session, username, email)
+    user_exists = await crud.user_exists(session, username, email)
     if user_exists:
         raise ConflictException(
             message="User with given email or username already exists.",
             details={"field": "email/username"},
         )
 
-    new_user = await auth_crud.create_user(session, user_create)
+    new_user = await crud.create_user(session, user_create)
 
     # send activation email
     activation_link = f"{settings.SERVER_HOST}{settings.API_V1_STR}/auth/activate?token={new_user.activation_token}"
@@ -100,7 +108,7 @@ async def register_user(
         body=email_body,
     )
 
-    user_read = cast(UserRead, UserRead.model_validate(new_user, from_attributes=True))
+    user_read = UserRead.from_orm_fast(new_user)
 
     return user_read
 
@@ -112,14 +120,17 @@ async def login(
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],  # noqa: B008
     session: Annotated[AsyncSession, Depends(get_session)],  # noqa: B008
+    crud: Annotated[UserCRUD, Depends(get_auth_crud)],  # noqa: B008
 ) -> TokenRead:
-    user = await auth_crud.get_user_for_auth(session, form_data.username)
+    user = await crud.get_user_for_auth(session, form_data.username)
     if not user:
         raise ResourceNotFoundException(
             resource_id=form_data.username,
             resource_type="User",
         )
-    if not verify_password(form_data.password, user.password_hash):
+    if not await run_in_threadpool(
+        verify_password, form_data.password, user.password_hash
+    ):
         raise ValidationException(
             message="Incorrect username or password.",
             details={"field": "credentials"},
@@ -174,9 +185,10 @@ async def login(
 async def activate_account(
     request: Request,
     session: Annotated[AsyncSession, Depends(get_session)],  # noqa: B008
+    crud: Annotated[UserCRUD, Depends(get_auth_crud)],  # noqa: B008
     token: str = Query(...),  # noqa: B008
 ) -> JSONResponse:
-    user = await auth_crud.get_by_activation_token(session, token)
+    user = await crud.get_by_activation_token(session, token)
     if not user:
         raise ValidationException(
             message="Invalid activation token.",
@@ -188,7 +200,7 @@ async def activate_account(
             content={"message": "Account already activated."},
         )
     user.is_verified = True
-    await auth_crud.update_user(session, str(user.uid), user)
+    await crud.update_user(session, str(user.uid), user)
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={"message": "Account activated successfully."},
@@ -224,8 +236,9 @@ async def forgot_password(
     password_reset_request: PasswordResetRequest,
     backend_tasks: BackgroundTasks,
     session: Annotated[AsyncSession, Depends(get_session)],  # noqa: B008
+    crud: Annotated[UserCRUD, Depends(get_auth_crud)],  # noqa: B008
 ) -> JSONResponse:
-    user = await auth_crud.get_by_email(session, password_reset_request.email)
+    user = await crud.get_by_email(session, password_reset_request.email)
     if not user:
         raise ResourceNotFoundException(
             resource_id=password_reset_request.email,
@@ -268,14 +281,17 @@ async def reset_password(
     request: Request,
     password_reset: PasswordReset,
     session: Annotated[AsyncSession, Depends(get_session)],  # noqa: B008
+    crud: Annotated[UserCRUD, Depends(get_auth_crud)],  # noqa: B008
 ) -> JSONResponse:
 
-    user = await auth_crud.get_by_reset_token(session, password_reset.token)
+    user = await crud.get_by_reset_token(session, password_reset.token)
     if not user or user.reset_token_expires_at < datetime.now(timezone.utc):
         raise ValidationException(
             message="Invalid or expired reset token", details={"field": "token"}
         )
-    user.password_hash = get_password_hash(password_reset.new_password)
+    user.password_hash = await run_in_threadpool(
+        get_password_hash, password_reset.new_password
+    )
     user.reset_token = None
     user.reset_token_expires_at = None
     session.add(user)
@@ -302,13 +318,17 @@ async def change_password(
     session: Annotated[AsyncSession, Depends(get_session)],  # noqa: B008
 ) -> JSONResponse:
 
-    if not verify_password(password_change.old_password, current_user.password_hash):
+    if not await run_in_threadpool(
+        verify_password, password_change.old_password, current_user.password_hash
+    ):
         raise ValidationException(
             message="Incorrect old password.",
             details={"field": "current_password"},
         )
 
-    current_user.password_hash = get_password_hash(password_change.new_password)
+    current_user.password_hash = await run_in_threadpool(
+        get_password_hash, password_change.new_password
+    )
     session.add(current_user)
     await session.commit()
 
@@ -51,6 +51,8 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGORITHM: str
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 64
+    REDIS_POOL_TIMEOUT: int = 5
     LOG_LEVEL: str
 
     RTMP_SERVER_URL: str
@@ -123,7 +123,7 @@ class RedisTokenBucketRateLimiter:
                 "reset": int(now + (self.capacity / max(1e-6, self.refill_rate))),
             }
 
-        # Redis returns bytes in some environments; ensure strings
+        # Replies are raw bytes (no decode_responses); float() accepts them
         allowed = bool(int(res[0]))
         tokens_left = float(res[1])
         reset_ts = float(res[2])
@@ -181,7 +181,7 @@ def redis_rate_limit(
                 )
 
             # Get Redis client from app state
-            if not hasattr(request.app.state, "redis"):
+            if getattr(request.app.state, "redis", None) is None:
                 logger.warning(
                     "Redis not available in app.state, allowing request through"
                 )
@@ -9,6 +9,8 @@ ModelType = TypeVar("ModelType", bound=SQLModel)
 
 
 class BaseCRUD(Generic[ModelType]):
+    __slots__ = ("model",)
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
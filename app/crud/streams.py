@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from typing import List, Optional
 
 # from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 from sqlmodel import desc, not_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -12,10 +13,15 @@ from app.crud.base import BaseCRUD
 from app.models.streams import Stream
 
 # from app.models.users import User
-from app.schemas.streams import StreamCreate, StreamUpdate
+from app.schemas.streams import StreamCreate, StreamPublicResponse, StreamUpdate
+
+LIVE_STREAM_COLUMNS = tuple(
+    getattr(Stream, field) for field in StreamPublicResponse.model_fields
+)
 
 
 class StreamCrud(BaseCRUD[Stream]):
+    __slots__ = ()
 
     def __init__(self) -> None:
         super().__init__(Stream)
@@ -57,9 +63,14 @@ class StreamCrud(BaseCRUD[Stream]):
     async def get_streams_by_user(
         session: AsyncSession, user_id: str, skip: int = 0, limit: int = 10
     ) -> List[Stream]:
-        """Get all streams for a user"""
+        """
+        Get all streams for a user.
+        The owner is eager-loaded so serializers can read stream.user
+        without a lazy load, which AsyncSession cannot do.
+        """
         stmt = (
             select(Stream)
+            .options(selectinload(Stream.user))
             .where(Stream.user_id == user_id)
             .order_by(desc(Stream.created_at))
             .offset(skip)
@@ -71,17 +82,19 @@ class StreamCrud(BaseCRUD[Stream]):
     @staticmethod
     async def get_live_streams(
         session: AsyncSession, skip: int = 0, limit: int = 20
-    ) -> List[Stream]:
+    ) -> List[StreamPublicResponse]:
         """Get all current live stream"""
+        # Lean listing: no ORM rows, so there is no user relation to load.
+        # Select only the public columns and skip ORM hydration entirely
         stmt = (
-            select(Stream)
+            select(*LIVE_STREAM_COLUMNS)
             .where(Stream.is_live, not_(Stream.is_private))
             .order_by(desc(Stream.current_viewers))
             .offset(skip)
             .limit(limit)
         )
         result = await session.execute(stmt)
-        return list(result.scalars().all())
+        return [StreamPublicResponse.model_construct(**row._mapping) for row in result]
 
     async def update_stream(
         self,
@@ -1,7 +1,9 @@
 from datetime import datetime, timezone
-from typing import Optional, cast
+from typing import Optional
 
+from fastapi.concurrency import run_in_threadpool
 from pydantic import EmailStr
+from sqlalchemy import bindparam, literal, or_
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -11,14 +13,26 @@ from app.crud.base import BaseCRUD
 from app.models.users import User
 from app.schemas.users import UserCreate, UserRead, UserUpdate
 
+# Built once; only the bound values change between calls
+USER_EXISTS_STMT = (
+    select(literal(1))
+    .select_from(User)
+    .where(
+        or_(User.username == bindparam("username"), User.email == bindparam("email"))
+    )
+    .limit(1)
+)
+
 
 class UserCRUD(BaseCRUD[User]):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(User)
 
     async def get_by_uid(self, session: AsyncSession, uid: str) -> Optional[UserRead]:
         user = await self.get(session, uid, field="uid")
-        return UserRead.model_validate(user, from_attributes=True) if user else None
+        return UserRead.from_orm_fast(user) if user else None
 
     async def get_user_by_uid(self, session: AsyncSession, uid: str) -> Optional[User]:
         return await self.get(session, uid, field="uid")
@@ -27,7 +41,7 @@ class UserCRUD(BaseCRUD[User]):
         self, session: AsyncSession, username: str
     ) -> Optional[UserRead]:
         user = await self.get(session, username, field="username")
-        return UserRead.model_validate(user, from_attributes=True) if user else None
+        return UserRead.from_orm_fast(user) if user else None
 
     async def get_user_for_auth(
         self, session: AsyncSession, username: str
@@ -43,12 +57,14 @@ class UserCRUD(BaseCRUD[User]):
         self, session: AsyncSession, email: EmailStr
     ) -> Optional[UserRead]:
         user = await self.get(session, email, field="email")
-        return UserRead.model_validate(user, from_attributes=True) if user else None
+        return UserRead.from_orm_fast(user) if user else None
 
     async def create_user(self, session: AsyncSession, user_in: UserCreate) -> User:
         data = user_in.model_dump()
         new_user = User(**data)
-        new_user.password_hash = get_password_hash(user_in.password)
+        new_user.password_hash = await run_in_threadpool(
+            get_password_hash, user_in.password
+        )
         new_user.activation_token = generate_token()
         new_user.is_active = True
         created_user = await self.create(session, new_user)
@@ -57,12 +73,10 @@ class UserCRUD(BaseCRUD[User]):
     async def user_exists(
         self, session: AsyncSession, username: str, email: EmailStr
     ) -> bool:
-        statement = select(User).where(
-            (User.username == username) | (User.email == email)
+        result = await session.execute(
+            USER_EXISTS_STMT, {"username": username, "email": email}
         )
-        result = await session.execute(statement)
-        user = result.first()
-        return user is not None
+        return result.first() is not None
 
     async def get_users(
         self, session: AsyncSession, skip: int = 0, limit: int = 100
@@ -70,18 +84,14 @@ class UserCRUD(BaseCRUD[User]):
         statement = select(User).offset(skip).limit(limit)
         result = await session.execute(statement)
         users = result.scalars().all()
-        return [UserRead.model_validate(user, from_attributes=True) for user in users]
+        return [UserRead.from_orm_fast(user) for user in users]
 
     async def update_user(
         self, session: AsyncSession, uid: str, user_in: UserUpdate
     ) -> Optional[UserRead]:
         data = user_in.model_dump(exclude_unset=True)
         updated_user = await self.update(session, uid, data, field="uid")
-        return (
-            UserRead.model_validate(updated_user, from_attributes=True)
-            if updated_user
-            else None
-        )
+        return UserRead.from_orm_fast(updated_user) if updated_user else None
 
     async def delete_user(self, session: AsyncSession, uid: str) -> bool:
         return await self.delete(session, uid, field="uid")
@@ -103,10 +113,10 @@ class UserCRUD(BaseCRUD[User]):
                 details={"field": "token"},
             )
 
-        return cast(UserRead, UserRead.model_validate(user, from_attributes=True))
+        return UserRead.from_orm_fast(user)
 
     async def get_by_activation_token(
         self, session: AsyncSession, token: str
     ) -> Optional[UserRead]:
         user = await self.get(session, token, field="activation_token")
-        return UserRead.model_validate(user, from_attributes=True) if user else None
+        return UserRead.from_orm_fast(user) if user else None
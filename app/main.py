@@ -1,29 +1,21 @@
+import json
 import logging
-
-# import os
-import signal
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Tuple, Union
 
 import redis.asyncio as redis
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, Request, Response, status
 from fastapi.responses import JSONResponse
-
-# from fastapi.exceptions import RequestValidationError
 from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
-
-# from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.router import routes
 from app.core.config import settings
 from app.core.exceptions import AppException, ConflictException, app_exception_handler
-from app.core.rate_limiter import (  # FixedWindowRateLimiter,; SlidingWindowRateLimiter,; TokenBucketRateLimiter,; get_rate_limiter_enabled,
-    RateLimitMiddleware,
-)
+from app.core.rate_limiter import RateLimitMiddleware
 from app.core.redis_rate_limiter import RedisTokenBucketRateLimiter
+from app.db.base import async_engine
 from app.utils.helper import get_user_identifier
 
 # Configure logging
@@ -48,8 +40,14 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    redis_url = settings.REDIS_URL
-    app.state.redis = redis.from_url(redis_url, decode_responses=True)
+    # Sized pool so bursts queue for a connection instead of opening new
+    # sockets; replies stay as bytes since the limiter only reads numbers.
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+    )
+    app.state.redis = redis.Redis.from_pool(pool)
 
     try:
         await app.state.redis.ping()
@@ -71,12 +69,15 @@ async def lifespan(app: FastAPI):
     # ---------------------------
     # SHUTDOWN
     # ---------------------------
-    if app.state.redis:
-        try:
-            await app.state.redis.aclose()
-            print("✅ Redis connection closed")
-        except Exception as e:
-            print(f"⚠️ Error closing Redis: {e}")
+    # uvicorn handles SIGINT/SIGTERM and only gets here once in-flight
+    # requests have drained, so closing the pools now is safe
+    try:
+        await app.state.redis.aclose()
+        logger.info("✅ Redis connection closed")
+    except Exception as e:
+        logger.warning(f"⚠️ Error closing Redis: {e}")
+
+    await async_engine.dispose()
 
 
 # Initialize FastAPI app
@@ -155,44 +156,43 @@ app.include_router(routes)
 
 
 # 🏥 Health Check Endpoints
+# Bodies are static, so serialize them once instead of on every probe
+HEALTH_BODY = json.dumps({"status": "healthy", "service": settings.APP_NAME}).encode()
+READY_BODY = json.dumps({"status": "ready"}).encode()
+ROOT_BODY = json.dumps(
+    {
+        "message": f"Welcome to {settings.APP_NAME}",
+        "version": "0.1.0",
+        "docs": f"{settings.API_V1_STR}/docs",
+    }
+).encode()
+
+
 @app.get("/health", tags=["health"])
-async def health_check() -> Dict[str, str]:
+async def health_check() -> Response:
     """Basic health check endpoint"""
-    return {"status": "healthy", "service": settings.APP_NAME}
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/health/ready", tags=["health"])
-async def readiness_check() -> Union[Dict[str, str], Tuple[Dict[str, str], int]]:
+async def readiness_check() -> Response:
     """Readiness check - returns 200 only if ready"""
     try:
         # Add any critical checks here
-        return {"status": "ready"}
+        return Response(content=READY_BODY, media_type="application/json")
     except Exception as e:
         error_msg = f"Readiness check failed: {e}"
         logger.error(error_msg)
-        return {"status": "not_ready", "error": str(e)}, 503
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "not_ready", "error": str(e)},
+        )
 
 
 @app.get("/", tags=["root"])
-async def root() -> Dict[str, str]:
+async def root() -> Response:
     """Root endpoint - API information"""
-    return {
-        "message": f"Welcome to {settings.APP_NAME}",
-        "version": "0.1.0",
-        "docs": f"{settings.API_V1_STR}/docs",
-    }
-
-
-# 🔧 Signal Handlers for graceful shutdown
-def signal_handler(signum: int, frame: Any) -> None:
-    """Handle termination signals gracefully"""
-    signal_name = signal.Signals(signum).name
-    logger.info(f"📌 Received {signal_name} signal")
-    raise SystemExit(0)
-
-
-signal.signal(signal.SIGTERM, signal_handler)
-signal.signal(signal.SIGINT, signal_handler)
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
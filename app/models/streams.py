@@ -1,15 +1,21 @@
-import secrets
+import base64
+import os
 import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
 import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import Index, desc, text
 from sqlmodel import Column, Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from app.models.users import User
 
 
+# Bound once; generate_stream_key runs on every stream creation
+_urlsafe_b64encode = base64.urlsafe_b64encode
+
+
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -65,6 +71,16 @@ class StreamBase(SQLModel):
 
 class Stream(StreamBase, table=True):
     __tablename__ = "streams"
+    __table_args__ = (
+        # get_streams_by_user: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_streams_user_created", "user_id", desc("created_at")),
+        # get_live_streams: live public streams ORDER BY current_viewers DESC
+        Index(
+            "ix_streams_live_viewers",
+            desc("current_viewers"),
+            postgresql_where=text("is_live AND NOT is_private"),
+        ),
+    )
 
     sid: Optional[uuid.UUID] = Field(
         default_factory=uuid.uuid4, primary_key=True, nullable=False, index=True
@@ -75,4 +91,5 @@ class Stream(StreamBase, table=True):
 
     @staticmethod
     def generate_stream_key() -> str:
-        return secrets.token_urlsafe(32)
+        # Same output as secrets.token_urlsafe(32): 43 url-safe chars
+        return _urlsafe_b64encode(os.urandom(32)).rstrip(b"=").decode("ascii")
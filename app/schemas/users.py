@@ -1,17 +1,153 @@
-import re
+import string
 import uuid
-from typing import Literal, Optional
-
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated, Any, Literal, Optional, Self
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    EmailStr,
+    Field,
+    StringConstraints,
+    ValidationError,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
+    field_validator,
+)
+from pydantic.networks import validate_email
+from pydantic_core import PydanticCustomError
 
 from app.enums.roles import UserRole
 
+PASSWORD_UPPER = frozenset(string.ascii_uppercase)
+PASSWORD_LOWER = frozenset(string.ascii_lowercase)
+PASSWORD_SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>_-+=[]\\;/`~')
+# Checked by pydantic-core's regex engine via StringConstraints(pattern=...)
+USERNAME_PATTERN = r"^[a-zA-Z0-9_-]+$"
+NAME_PATTERN = r"^[a-zA-Z\s\-']+$"
+# Cheap, Unicode-aware pre-filter that rejects obvious garbage with a
+# readable message: one "@", no whitespace, RFC specials or empty dot-atoms,
+# and a dotted domain with a letter or punycode TLD. email-validator still
+# has the last word (check_email_address), so input and EmailStr on the
+# output models always agree
+EMAIL_PATTERN = (
+    r'^[^\s@.<>()\[\],;:"\\]+(?:\.[^\s@.<>()\[\],;:"\\]+)*'
+    r"@(?:[^\W_](?:(?:[^\W_]|-)*[^\W_])?\.)+"
+    r"(?:[^\W\d_]{2,}|xn--(?:[^\W_]|-)+)$"
+)
+
+
+def validate_password_strength(v: str) -> str:
+    """Shared password policy for registration, change and reset."""
+    if len(v) < 8:
+        raise ValueError("Password must be at least 8 characters long")
+
+    # One pass over the string instead of a regex scan per character class
+    has_upper = has_lower = has_digit = has_special = False
+    for ch in v:
+        if ch in PASSWORD_UPPER:
+            has_upper = True
+        elif ch in PASSWORD_LOWER:
+            has_lower = True
+        elif ch.isdecimal():
+            has_digit = True
+        elif ch in PASSWORD_SPECIAL:
+            has_special = True
+
+    if not has_upper:
+        raise ValueError("Password must contain at least one uppercase letter")
+
+    if not has_lower:
+        raise ValueError("Password must contain at least one lowercase letter")
+
+    if not has_digit:
+        raise ValueError("Password must contain at least one digit")
+
+    if not has_special:
+        raise ValueError("Password must contain at least one special character")
+
+    return v
+
+
+def strip_str(v: Any) -> Any:
+    """Trim surrounding whitespace before length and pattern checks run."""
+    return v.strip() if isinstance(v, str) else v
+
+
+def normalise_email(v: Any) -> Any:
+    """Trim and lowercase an email before its pattern is checked."""
+    return v.strip().lower() if isinstance(v, str) else v
+
+
+def check_email_address(v: str) -> str:
+    """
+    Run the same email-validator check as EmailStr, so every address
+    accepted on input also validates in UserRead.
+    """
+    return validate_email(v)[1]
+
+
+def pattern_message(message: str) -> WrapValidator:
+    """
+    Replace pydantic's pattern-mismatch error, which echoes the regex,
+    with a readable message; the pattern itself still runs in pydantic-core.
+    """
+
+    def validate(v: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+        try:
+            return handler(v)
+        except ValidationError as exc:
+            if any(e["type"] == "string_pattern_mismatch" for e in exc.errors()):
+                raise PydanticCustomError("string_pattern_mismatch", message) from None
+            raise
+
+    return WrapValidator(validate)
+
+
+# Shared field types: one validator definition reused by every schema.
+# Constraints sit on the inner str so pydantic-core checks them natively,
+# after the BeforeValidator has trimmed the value
+UsernameStr = Annotated[
+    str,
+    StringConstraints(min_length=3, max_length=50, pattern=USERNAME_PATTERN),
+    BeforeValidator(strip_str),
+    pattern_message(
+        "Username can only contain letters, numbers, hyphens, and underscores"
+    ),
+]
+NameStr = Annotated[
+    str,
+    StringConstraints(min_length=1, max_length=50, pattern=NAME_PATTERN),
+    BeforeValidator(strip_str),
+    pattern_message("Name contains invalid characters"),
+]
+Email = Annotated[
+    str,
+    StringConstraints(max_length=254, pattern=EMAIL_PATTERN),
+    BeforeValidator(normalise_email),
+    pattern_message("Invalid email format"),
+    AfterValidator(check_email_address),
+]
+
+
+def validate_email_extra(v: str) -> str:
+    """Shared XSS check for user schemas; Email has already normalised v."""
+    # Basic XSS prevention; "<" and ">" never match EMAIL_PATTERN
+    if "script" in v:
+        raise ValueError("Invalid email format")
+
+    return v
+
 
 class UserCreate(BaseModel):
-    username: str = Field(..., min_length=3, max_length=50)
-    email: EmailStr
-    first_name: Optional[str] = Field(..., min_length=1, max_length=50)
-    last_name: Optional[str] = Field(..., min_length=1, max_length=50)
+    # Build validators on first use; subclasses inherit this
+    model_config = ConfigDict(defer_build=True)
+
+    username: UsernameStr
+    email: Email
+    first_name: Optional[NameStr]
+    last_name: Optional[NameStr]
     password: str = Field(..., min_length=6, max_length=128)
 
     role: UserRole = UserRole.VIEWER
@@ -29,83 +165,23 @@ class UserCreate(BaseModel):
         - At least one digit
         - At least one special character
         """
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-
-        if not re.search(r"[A-Z]", v):
-            raise ValueError("Password must contain at least one uppercase letter")
-
-        if not re.search(r"[a-z]", v):
-            raise ValueError("Password must contain at least one lowercase letter")
-
-        if not re.search(r"\d", v):
-            raise ValueError("Password must contain at least one digit")
-
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\;/`~]', v):
-            raise ValueError("Password must contain at least one special character")
-
-        return v
-
-    @field_validator("username")
-    @classmethod
-    def validate_username_format(cls, v: str) -> str:
-        """
-        Validate username format to prevent XSS and injection attacks.
-        Only allows alphanumeric characters, hyphens, and underscores.
-        """
-        v = v.strip()
-
-        if not v or v.isspace():
-            raise ValueError("Username cannot be empty or whitespace only")
-
-        if not re.match(r"^[a-zA-Z0-9_-]+$", v):
-            raise ValueError(
-                "Username can only contain letters, numbers, hyphens, and underscores"
-            )
-
-        # Check for common XSS patterns
-        xss_patterns = ["<script", "javascript:", "onerror=", "onload=", "<img"]
-        if any(pattern in v.lower() for pattern in xss_patterns):
-            raise ValueError("Invalid characters in username")
-
-        return v
-
-    @field_validator("first_name", "last_name")
-    @classmethod
-    def validate_name_fields(cls, v: str) -> str:
-        """
-        Validate name fields.
-        Trim whitespace and ensure not empty.
-        """
-        v = v.strip()
-
-        if not v or v.isspace():
-            raise ValueError("Name cannot be empty or whitespace only")
-
-        # Allow letters, spaces, hyphens, and apostrophes for names
-        if not re.match(r"^[a-zA-Z\s\-']+$", v):
-            raise ValueError("Name contains invalid characters")
-
-        return v
+        return validate_password_strength(v)
 
     @field_validator("email")
     @classmethod
-    def validate_email_format(cls, v: EmailStr) -> EmailStr:
+    def validate_email_format(cls, v: str) -> str:
         """
         Additional email validation.
-        EmailStr already validates format, this adds extra checks.
+        Email already validates format, this adds extra checks.
         """
-        # Convert to lowercase for consistency
-        email_str = str(v).lower().strip()
-
-        # Basic XSS prevention
-        if "<" in email_str or ">" in email_str or "script" in email_str.lower():
-            raise ValueError("Invalid email format")
-
-        return email_str
+        return validate_email_extra(v)
 
 
 class PublicUserCreate(UserCreate):
+    # Request body of /register: FastAPI builds it when the route is
+    # registered, so deferring only moves the cost and trips a warning
+    model_config = ConfigDict(defer_build=False)
+
     role: Literal[UserRole.VIEWER, UserRole.STREAMER] = UserRole.VIEWER
 
 
@@ -125,36 +201,28 @@ class UserRead(BaseModel):
     is_verified: bool
     role: UserRole
 
+    @classmethod
+    def from_orm_fast(cls, user: Any) -> Self:
+        """
+        Build from a trusted DB row without re-validating it.
+        Use model_validate for anything that comes from a client.
+        """
+        data = {name: getattr(user, name) for name in cls.model_fields}
+        data["role"] = UserRole(data["role"])
+        return cls.model_construct(**data)
+
 
 class UserReadWithToken(UserRead):
     activation_token: Optional[str] = None
 
 
 class UserUpdate(BaseModel):
-    first_name: Optional[str] = Field(..., min_length=1, max_length=50)
-    last_name: Optional[str] = Field(..., min_length=1, max_length=50)
+    first_name: Optional[NameStr] = None
+    last_name: Optional[NameStr] = None
     is_active: Optional[bool] = None
     is_verified: Optional[bool] = None
     role: Optional[UserRole] = None
 
-    @field_validator("first_name", "last_name")
-    @classmethod
-    def validate_name_fields(cls, v: str) -> str:
-        """
-        Validate name fields.
-        Trim whitespace and ensure not empty.
-        """
-        v = v.strip()
-
-        if not v or v.isspace():
-            raise ValueError("Name cannot be empty or whitespace only")
-
-        # Allow letters, spaces, hyphens, and apostrophes for names
-        if not re.match(r"^[a-zA-Z\s\-']+$", v):
-            raise ValueError("Name contains invalid characters")
-
-        return v
-
 
 class TokenRead(BaseModel):
     access_token: str
@@ -172,44 +240,22 @@ class PasswordChange(BaseModel):
     @classmethod
     def validate_password_strength(cls, v: str) -> str:
         """Same password validation as registration."""
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-
-        if not re.search(r"[A-Z]", v):
-            raise ValueError("Password must contain at least one uppercase letter")
-
-        if not re.search(r"[a-z]", v):
-            raise ValueError("Password must contain at least one lowercase letter")
-
-        if not re.search(r"\d", v):
-            raise ValueError("Password must contain at least one digit")
-
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\;/`~]', v):
-            raise ValueError("Password must contain at least one special character")
-
-        return v
+        return validate_password_strength(v)
 
 
 class PasswordResetRequest(BaseModel):
     """ """
 
-    email: EmailStr
+    email: Email
 
     @field_validator("email")
     @classmethod
-    def validate_email_format(cls, v: EmailStr) -> EmailStr:
+    def validate_email_format(cls, v: str) -> str:
         """
         Additional email validation.
-        EmailStr already validates format, this adds extra checks.
+        Email already validates format, this adds extra checks.
         """
-        # Convert to lowercase for consistency
-        email_str = str(v).lower().strip()
-
-        # Basic XSS prevention
-        if "<" in email_str or ">" in email_str or "script" in email_str.lower():
-            raise ValueError("Invalid email format")
-
-        return email_str
+        return validate_email_extra(v)
 
 
 class PasswordReset(BaseModel):
@@ -222,19 +268,4 @@ class PasswordReset(BaseModel):
     @classmethod
     def validate_password_strength(cls, v: str) -> str:
         """Same password validation as registration."""
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-
-        if not re.search(r"[A-Z]", v):
-            raise ValueError("Password must contain at least one uppercase letter")
-
-        if not re.search(r"[a-z]", v):
-            raise ValueError("Password must contain at least one lowercase letter")
-
-        if not re.search(r"\d", v):
-            raise ValueError("Password must contain at least one digit")
-
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\;/`~]', v):
-            raise ValueError("Password must contain at least one special character")
-
-        return v
+        return validate_password_strength(v)
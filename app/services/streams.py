@@ -1,7 +1,9 @@
 from datetime import datetime, timezone
+from typing import NoReturn
 
 # from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import select
+from sqlalchemy import case, update
+from sqlmodel import not_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.exceptions import ResourceNotFoundException, ValidationException
@@ -9,75 +11,107 @@ from app.models.streams import Stream
 
 
 class StreamService:
+    __slots__ = ()
+
     @staticmethod
-    async def start_stream(
-        session: AsyncSession, stream_id: str, user_id: str
-    ) -> Stream:
+    async def _raise_transition_error(
+        session: AsyncSession, stream_id: str, user_id: str, message: str
+    ) -> NoReturn:
+        """Tell a missing/foreign stream (404) apart from a wrong live state"""
         result = await session.execute(
-            select(Stream).where(Stream.sid == stream_id, Stream.user_id == user_id)
+            select(Stream.sid).where(Stream.sid == stream_id, Stream.user_id == user_id)
         )
-        stream: Stream | None = result.scalars().first()
-
-        if not stream:
+        if result.first() is None:
             raise ResourceNotFoundException(
                 resource_id=stream_id, resource_type="Stream"
             )
+        raise ValidationException(message=message)
 
-        if stream.is_live:
-            raise ValidationException(message="Stream is already live")
+    @staticmethod
+    async def start_stream(
+        session: AsyncSession, stream_id: str, user_id: str
+    ) -> Stream:
+        # Single UPDATE ... RETURNING; the is_live guard makes it race-free
+        stmt = (
+            update(Stream)
+            .where(
+                Stream.sid == stream_id,
+                Stream.user_id == user_id,
+                not_(Stream.is_live),
+            )
+            .values(
+                is_live=True,
+                started_at=datetime.now(timezone.utc),
+                ended_at=None,
+                current_viewers=0,
+            )
+            .returning(Stream)
+            .execution_options(populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        stream: Stream | None = result.scalars().first()
 
-        stream.is_live = True
-        stream.started_at = datetime.now(timezone.utc)
-        stream.ended_at = None
-        stream.current_viewers = 0
+        if stream is None:
+            await StreamService._raise_transition_error(
+                session, stream_id, user_id, "Stream is already live"
+            )
 
         await session.commit()
-        await session.refresh(stream)
         return stream
 
     @staticmethod
     async def stop_stream(
         session: AsyncSession, stream_id: str, user_id: str
     ) -> Stream:
-        result = await session.execute(
-            select(Stream).where(Stream.sid == stream_id, Stream.user_id == user_id)
+        stmt = (
+            update(Stream)
+            .where(
+                Stream.sid == stream_id,
+                Stream.user_id == user_id,
+                Stream.is_live,
+            )
+            .values(
+                is_live=False,
+                ended_at=datetime.now(timezone.utc),
+                current_viewers=0,
+            )
+            .returning(Stream)
+            .execution_options(populate_existing=True)
         )
+        result = await session.execute(stmt)
         stream: Stream | None = result.scalars().first()
 
-        if not stream:
-            raise ResourceNotFoundException(
-                resource_id=stream_id, resource_type="Stream"
+        if stream is None:
+            await StreamService._raise_transition_error(
+                session, stream_id, user_id, "Stream is not live"
             )
 
-        if not stream.is_live:
-            raise ValidationException(message="Stream is not live")
-
-        stream.is_live = False
-        stream.ended_at = datetime.now(timezone.utc)
-        stream.current_viewers = 0
-
         await session.commit()
-        await session.refresh(stream)
         return stream
 
     @staticmethod
     async def update_viewer_count(
         session: AsyncSession, stream_id: str, viewer_count: int
     ):
-        result = await session.execute(select(Stream).where(Stream.sid == stream_id))
-        stream = result.scalars().first()
-
-        if stream:
-            stream.current_viewers = viewer_count
-            if viewer_count > stream.peak_viewers:
-                stream.peak_viewers = viewer_count
-            await session.commit()
+        await session.execute(
+            update(Stream)
+            .where(Stream.sid == stream_id)
+            .values(
+                current_viewers=viewer_count,
+                # CASE rather than GREATEST so it also runs on SQLite
+                peak_viewers=case(
+                    (Stream.peak_viewers < viewer_count, viewer_count),
+                    else_=Stream.peak_viewers,
+                ),
+            )
+        )
+        await session.commit()
 
     @staticmethod
     async def increment_total_views(session: AsyncSession, stream_id: str):
-        result = await session.execute(select(Stream).where(Stream.sid == stream_id))
-        stream = result.scalars().first()
-
-        if stream:
-            stream.total_views += 1
-            await session.commit()
+        await session.execute(
+            update(Stream)
+            .where(Stream.sid == stream_id)
+            .values(total_views=Stream.total_views + 1)
+        )
+        await session.commit()
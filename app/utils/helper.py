@@ -1,10 +1,13 @@
+import hashlib
+
 from fastapi import Request
 
 
 def get_client_ip(request: Request) -> str:
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        return str(forwarded.split(",")[0].strip())
+        comma = forwarded.find(",")
+        return (forwarded[:comma] if comma != -1 else forwarded).strip()
 
     if request.client is not None:
         return str(request.client.host)
@@ -12,12 +15,18 @@ def get_client_ip(request: Request) -> str:
     return "unknown"
 
 
+def _token_fingerprint(token: str) -> str:
+    """Short, stable digest of a bearer token for use in rate-limit keys"""
+    # Not cached: the cache keys would keep raw tokens in memory
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
 def get_user_identifier(request: Request) -> str:
     """Extract user identifier (e.g., from auth token)"""
     # Try to get user from auth header
     auth = request.headers.get("Authorization")
     if auth and auth.startswith("Bearer "):
-        return str(auth[7:])  # Use token as identifier
+        return _token_fingerprint(auth[7:])  # Use token digest as identifier
 
     # Fallback to IP
-    return str(get_client_ip(request))
+    return get_client_ip(request)
@@ -10,14 +10,17 @@ This module provides:
 """
 
 import asyncio
-
-# from datetime import datetime, timezone
+from datetime import datetime, timezone
 from typing import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -25,13 +28,21 @@ from sqlmodel import SQLModel
 
 from app.core.security import JWTHandler, get_password_hash
 from app.enums.roles import PublicUserRole
-from app.main import app
+from app.main import app as fastapi_app
 from app.models.users import User
 
 # from app.schemas.users import UserRead
 
 # Test Database Configuration
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+TEST_PASSWORD = "SecurePassword123!"
+TEST_USER_DATA = {
+    "username": "testuser",
+    "email": "test@example.com",
+    "password": TEST_PASSWORD,
+    "first_name": "Test",
+    "last_name": "User",
+}
 
 
 # ============================================================================
@@ -58,15 +69,15 @@ def event_loop(event_loop_policy):
 # ============================================================================
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 async def test_engine() -> AsyncGenerator[AsyncEngine, None]:
     """
     Create a test database engine with SQLite in-memory.
 
     This fixture:
-    - Creates a new in-memory database for each test
-    - Sets up all tables from SQLModel metadata
-    - Cleans up after the test completes
+    - Creates a single in-memory database for the whole test session
+    - Sets up all tables from SQLModel metadata once
+    - Cleans up after the session completes
     """
     engine = create_async_engine(
         TEST_DATABASE_URL,
@@ -75,6 +86,16 @@ async def test_engine() -> AsyncGenerator[AsyncEngine, None]:
         echo=False,
     )
 
+    # pysqlite defers BEGIN on its own, which breaks SAVEPOINT handling; let
+    # SQLAlchemy emit BEGIN so the per-test outer transaction can roll back
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
@@ -94,14 +115,30 @@ async def session(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None
     Create a test database session.
 
     This fixture provides an async database session for tests that need
-    to interact with the database directly.
+    to interact with the database directly. The session runs inside an
+    outer transaction that is rolled back afterwards, so commits made by
+    the test only release a savepoint and never leak into other tests.
     """
-    async_session_maker = sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
-    )
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        async_session_maker = sessionmaker(
+            bind=conn,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
 
-    async with async_session_maker() as session:
-        yield session
+        async with async_session_maker() as session:
+            yield session
+
+        await trans.rollback()
+
+
+async def _clear_tables(engine: AsyncEngine) -> None:
+    """Delete rows committed through the API so each test starts empty."""
+    async with engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            await conn.execute(table.delete())
 
 
 # ============================================================================
@@ -112,23 +149,47 @@ async def session(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None
 @pytest.fixture
 def test_user_data():
     """Provide standard test user data."""
-    return {
-        "username": "testuser",
-        "email": "test@example.com",
-        "password": "SecurePassword123!",
-        "first_name": "Test",
-        "last_name": "User",
-    }
+    return dict(TEST_USER_DATA)
+
+
+@pytest.fixture
+def now_utc() -> datetime:
+    """
+    Timezone-aware 'now' for building expiry timestamps in a test.
+    Taken per test: expiries are checked against the real clock.
+    """
+    return datetime.now(timezone.utc)
+
+
+@pytest.fixture(scope="session")
+def hashed_test_password() -> str:
+    """Hash the shared test password once; hashing is deliberately slow."""
+    return get_password_hash(TEST_PASSWORD)
+
+
+@pytest.fixture(scope="session")
+def created_user_uid() -> UUID:
+    """Stable uid for created_user, so its access token can be shared."""
+    return uuid4()
+
+
+@pytest.fixture(scope="session")
+def hashed_correctpassword() -> str:
+    """Hash of "correctpassword" for tests that log in a hand-built user."""
+    return get_password_hash("correctpassword")
 
 
 @pytest.fixture
-def created_user(test_user_data):
-    """Mock a user object that exists in the database."""
+def created_user(test_user_data, hashed_test_password, created_user_uid):
+    """
+    Mock a user object that exists in the database.
+    Tests mutate it, so each one gets a fresh instance with the same uid.
+    """
     return User(
-        uid=uuid4(),
+        uid=created_user_uid,
         username=test_user_data["username"],
         email=test_user_data["email"],
-        password_hash=get_password_hash(test_user_data["password"]),
+        password_hash=hashed_test_password,
         first_name=test_user_data["first_name"],
         last_name=test_user_data["last_name"],
         role=PublicUserRole.VIEWER,
@@ -139,13 +200,13 @@ def created_user(test_user_data):
 
 
 @pytest.fixture
-def unverified_user(test_user_data):
+def unverified_user(test_user_data, hashed_test_password):
     """Mock an unverified user."""
     return User(
         uid=uuid4(),
         username=test_user_data["username"],
         email=test_user_data["email"],
-        password_hash=get_password_hash(test_user_data["password"]),
+        password_hash=hashed_test_password,
         first_name=test_user_data["first_name"],
         last_name=test_user_data["last_name"],
         role=PublicUserRole.VIEWER,
@@ -156,13 +217,13 @@ def unverified_user(test_user_data):
 
 
 @pytest.fixture
-def inactive_user(test_user_data):
+def inactive_user(test_user_data, hashed_test_password):
     """Mock an inactive user."""
     return User(
         uid=uuid4(),
         username=test_user_data["username"],
         email=test_user_data["email"],
-        password_hash=get_password_hash(test_user_data["password"]),
+        password_hash=hashed_test_password,
         first_name=test_user_data["first_name"],
         last_name=test_user_data["last_name"],
         role=PublicUserRole.VIEWER,
@@ -172,80 +233,121 @@ def inactive_user(test_user_data):
     )
 
 
+@pytest.fixture(scope="session")
+def token_user_data(created_user_uid):
+    """Claims signed into created_user's tokens."""
+    return {
+        "username": TEST_USER_DATA["username"],
+        "email": TEST_USER_DATA["email"],
+        "uid": str(created_user_uid),
+        "first_name": TEST_USER_DATA["first_name"],
+        "last_name": TEST_USER_DATA["last_name"],
+        "role": PublicUserRole.VIEWER,
+        "is_active": True,
+        "is_verified": True,
+    }
+
+
+@pytest.fixture(scope="session")
+def access_token(token_user_data):
+    """Generate a valid access token for created_user once per session."""
+    return JWTHandler.create_access_token(user_data=token_user_data)
+
+
+@pytest.fixture(scope="session")
+def token_parts(access_token):
+    """access_token split into its (header, payload, signature) segments."""
+    return tuple(access_token.split("."))
+
+
+@pytest.fixture(scope="session")
+def refresh_token(token_user_data):
+    """Generate a valid refresh token for created_user once per session."""
+    return JWTHandler.create_access_token(user_data=token_user_data, refresh=True)
+
+
+# ============================================================================
+# Application Fixtures
+# ============================================================================
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """The FastAPI application under test, shared by the whole session."""
+    return fastapi_app
+
+
+@pytest.fixture(autouse=True)
+def _restore_dependency_overrides(app: FastAPI) -> Generator[None, None, None]:
+    """Undo any dependency_overrides a test or fixture installs."""
+    overrides = dict(app.dependency_overrides)
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(overrides)
+
+
+class FakeAuthCrud:
+    """Stand-in for the auth routes' UserCRUD; set return values per test."""
+
+    def __init__(self) -> None:
+        self.user_exists = AsyncMock(return_value=False)
+        self.create_user = AsyncMock()
+        self.get_user_for_auth = AsyncMock(return_value=None)
+        self.get_by_activation_token = AsyncMock(return_value=None)
+        self.get_by_email = AsyncMock(return_value=None)
+        self.get_by_reset_token = AsyncMock(return_value=None)
+        self.update_user = AsyncMock()
+
+
 @pytest.fixture
-def access_token(created_user):
-    """Generate a valid access token for testing."""
-    return JWTHandler.create_access_token(
-        user_data={
-            "username": created_user.username,
-            "email": created_user.email,
-            "uid": str(created_user.uid),
-            "first_name": created_user.first_name,
-            "last_name": created_user.last_name,
-            "role": created_user.role,
-            "is_active": created_user.is_active,
-            "is_verified": created_user.is_verified,
-        }
-    )
+def fake_crud(app: FastAPI) -> FakeAuthCrud:
+    """Inject a FakeAuthCrud through the get_auth_crud dependency."""
+    from app.api.v1.https.auth import get_auth_crud
+
+    fake = FakeAuthCrud()
+    app.dependency_overrides[get_auth_crud] = lambda: fake
+    return fake
 
 
 # ============================================================================
-# FastAPI Client Fixture
+# Session-wide Patches
 # ============================================================================
 
 
-@pytest.fixture(scope="function")
-def client(test_engine: AsyncEngine) -> Generator[TestClient, None, None]:
+@pytest.fixture(scope="session", autouse=True)
+def _fast_password_hashing():
     """
-    Create a test client with mocked dependencies.
-
-    This fixture:
-    - Overrides the database session dependency
-    - Mocks Redis rate limiting
-    - Mocks email sending
-    - Mocks authentication dependencies
-    - Provides a TestClient for making HTTP requests
+    Hash with the cheapest argon2 parameters for the whole session.
+    Production cost is still checked by test_production_hash_parameters.
     """
-
-    # Create session factory for dependency override
-    async_session_maker = sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
+    fast_context = CryptContext(
+        schemes=["argon2"],
+        argon2__time_cost=1,
+        argon2__memory_cost=8,  # KiB, argon2's minimum
+        argon2__parallelism=1,
     )
+    with patch("app.core.security.pwd_context", fast_context):
+        yield fast_context
 
-    async def get_session_override() -> AsyncGenerator[AsyncSession, None]:
-        async with async_session_maker() as session:
-            yield session
 
-    # Override dependencies
-    from app.db.session import get_session
+@pytest.fixture(scope="session", autouse=True)
+def _warmup_password_hashing(_fast_password_hashing):
+    """Load the argon2 backend up front so no single test pays for it."""
+    get_password_hash("warmup")
+
 
-    app.dependency_overrides[get_session] = get_session_override
-
-    # Create context managers for all mocks
-    with (
-        patch("app.core.redis_rate_limiter.redis_rate_limit") as mock_rate_limit,
-        patch("app.core.redis.token_blocklist") as mock_token_blocklist,
-        patch("app.api.v1.https.auth.send_email") as mock_send_email,
-        patch(
-            "app.core.redis.add_jti_to_blocklist", new_callable=AsyncMock
-        ) as mock_blocklist,
-        patch(
-            "app.core.redis.token_in_blocklist", new_callable=AsyncMock
-        ) as mock_token_check,
-    ):
-
-        # Configure rate limiter mock (decorator that does nothing)
+@pytest.fixture(scope="session", autouse=True)
+def _patch_rate_limit():
+    """Make the rate limiter decorator a no-op."""
+    with patch("app.core.redis_rate_limiter.redis_rate_limit") as mock_rate_limit:
         mock_rate_limit.return_value = lambda func: func
+        yield mock_rate_limit
 
-        # Configure Redis client mock
-        mock_redis_instance = MagicMock()
-        mock_redis_instance.get = AsyncMock(return_value=None)
-        mock_redis_instance.setex = AsyncMock(return_value=True)
-        mock_redis_instance.delete = AsyncMock(return_value=True)
-        mock_redis_instance.exists = AsyncMock(return_value=False)
-        # mock_redis_client.return_value = mock_redis_instance
 
-        # Configure token blocklist mock
+@pytest.fixture(scope="session", autouse=True)
+def _patch_token_blocklist():
+    """Replace the Redis token blocklist client."""
+    with patch("app.core.redis.token_blocklist") as mock_token_blocklist:
         mock_token_blocklist_instance = MagicMock()
         mock_token_blocklist_instance.get = AsyncMock(return_value=None)
         mock_token_blocklist_instance.set = AsyncMock(return_value=True)
@@ -253,33 +355,116 @@ def client(test_engine: AsyncEngine) -> Generator[TestClient, None, None]:
         mock_token_blocklist_instance.delete = AsyncMock(return_value=True)
         mock_token_blocklist_instance.exists = AsyncMock(return_value=False)
         mock_token_blocklist.return_value = mock_token_blocklist_instance
+        yield mock_token_blocklist
 
-        # Configure email mock
+
+@pytest.fixture(scope="session", autouse=True)
+def _patch_send_email():
+    """Stop the auth routes from sending real email."""
+    with patch("app.api.v1.https.auth.send_email") as mock_send_email:
         mock_send_email.return_value = None
+        yield mock_send_email
+
 
-        # Configure blocklist function mocks
+@pytest.fixture(scope="session", autouse=True)
+def _patch_add_jti_to_blocklist():
+    """Stub out blocklisting of revoked token ids."""
+    with patch(
+        "app.core.redis.add_jti_to_blocklist", new_callable=AsyncMock
+    ) as mock_blocklist:
         mock_blocklist.return_value = None
+        yield mock_blocklist
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _patch_token_in_blocklist():
+    """Report every token as not blocklisted."""
+    with patch(
+        "app.core.redis.token_in_blocklist", new_callable=AsyncMock
+    ) as mock_token_check:
         mock_token_check.return_value = False  # Token not in blocklist
+        yield mock_token_check
 
-        async def mock_get_current_active_user():
-            # Return a default mock user for tests
-            return User(
-                uid=uuid4(),
-                username="testuser",
-                email="test@example.com",
-                password_hash=get_password_hash("SecurePassword123!"),
-                last_name="User",
-                role=PublicUserRole.VIEWER,
-                is_active=True,
-                is_verified=True,
-            )
-
-        # Create and yield test client
-        with TestClient(app) as test_client:
-            yield test_client
-
-    # Clear overrides after test
-    app.dependency_overrides.clear()
+
+# ============================================================================
+# FastAPI Client Fixture
+# ============================================================================
+
+
+def _override_get_session(engine: AsyncEngine) -> None:
+    """Point the app's get_session dependency at the test engine."""
+    from app.db.session import get_session
+
+    # Create session factory for dependency override
+    async_session_maker = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def get_session_override() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_maker() as session:
+            yield session
+
+    fastapi_app.dependency_overrides[get_session] = get_session_override
+
+
+@pytest.fixture(scope="session")
+def _app_client(app: FastAPI) -> Generator[TestClient, None, None]:
+    """
+    Run the app lifespan once and share the TestClient across tests.
+
+    Per-test isolation comes from restoring dependency overrides and from
+    clearing tables after each test.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="function")
+def client(
+    _app_client: TestClient, test_engine: AsyncEngine
+) -> Generator[TestClient, None, None]:
+    """
+    Provide the shared test client with mocked dependencies.
+
+    This fixture:
+    - Overrides the database session dependency
+    - Clears rows written through the API after the test
+
+    Redis, email and blocklist mocks are installed once by the
+    session-scoped autouse fixtures above.
+    """
+
+    _override_get_session(test_engine)
+
+    yield _app_client
+
+    _app_client.portal.call(_clear_tables, test_engine)
+
+
+@pytest.fixture(scope="session")
+async def _async_app_client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """
+    Share one httpx AsyncClient that calls the ASGI app in-process.
+
+    Requests run on the test's own event loop, without the portal thread
+    TestClient uses. The lifespan is not run; the session-scoped autouse
+    fixtures already stand in for Redis and email.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture(scope="function")
+async def async_client(
+    _async_app_client: AsyncClient, test_engine: AsyncEngine
+) -> AsyncGenerator[AsyncClient, None]:
+    """Provide the shared async client with the test database wired in."""
+    _override_get_session(test_engine)
+
+    yield _async_app_client
+
+    await _clear_tables(test_engine)
 
 
 # ============================================================================
@@ -336,6 +521,19 @@ def mock_add_jti_to_blocklist():
         yield mock_func
 
 
+@pytest.fixture
+def mock_verify_password(request):
+    """
+    Patch the auth routes' verify_password.
+    The result defaults to True; parametrize indirectly to override it.
+    """
+    result = getattr(request, "param", True)
+    with patch(
+        "app.api.v1.https.auth.verify_password", return_value=result
+    ) as mock_verify:
+        yield mock_verify
+
+
 # ============================================================================
 # Pytest Configuration
 # ============================================================================
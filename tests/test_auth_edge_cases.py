@@ -11,102 +11,104 @@ These tests cover:
 """
 
 import asyncio
+import os
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
 from fastapi import status
+from pydantic import ValidationError
 
 from app.core.security import JWTHandler, get_password_hash
+from app.core.security import pwd_context as production_pwd_context
+from app.core.security import verify_password
+from app.models.users import User
+from app.schemas.users import PublicUserCreate
+
+SQL_INJECTION_ATTEMPTS = [
+    "' OR '1'='1",
+    "admin'--",
+    "' OR 1=1--",
+    "admin' OR '1'='1'--",
+    "'; DROP TABLE users--",
+]
+
+XSS_PAYLOADS = [
+    "<script>alert('XSS')</script>",
+    "<img src=x onerror=alert('XSS')>",
+    "javascript:alert('XSS')",
+]
+
+WEAK_PASSWORDS = [
+    "123456",  # Too simple
+    "password",  # Common word
+    "abc",  # Too short
+    "        ",  # Only spaces
+]
+
+INVALID_EMAILS = [
+    "notanemail",
+    "@example.com",
+    "user@",
+    "user @example.com",  # Space in email
+    "user..name@example.com",  # Double dots
+    "user@example",  # No TLD
+    "user@.com",  # Missing domain
+    "probe@foo.test",  # Special-use domain
+]
+
+
+async def _no_user(*args, **kwargs):
+    """Cheaper than an AsyncMock where nothing asserts on the call."""
+    return None
+
+
+@pytest.fixture(autouse=True)
+def auth_mocks(fake_crud):
+    """Route every test through the fake auth CRUD instead of patching it."""
+    return fake_crud
 
 
 class TestSecurityVulnerabilities:
     """Test for common security vulnerabilities."""
 
-    @patch("app.api.v1.https.auth.auth_crud.get_user_for_auth", new_callable=AsyncMock)
-    def test_sql_injection_login_username(self, mock_get_user, client):
+    @pytest.mark.parametrize("injection", SQL_INJECTION_ATTEMPTS)
+    def test_sql_injection_login_username(self, auth_mocks, client, injection):
         """Test SQL injection attempts in username field."""
-        sql_injection_attempts = [
-            "' OR '1'='1",
-            "admin'--",
-            "' OR 1=1--",
-            "admin' OR '1'='1'--",
-            "'; DROP TABLE users--",
+        auth_mocks.get_user_for_auth = _no_user
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": injection, "password": "password"},
+        )
+        # Should not cause errors, just return user not found
+        assert response.status_code in [
+            status.HTTP_404_NOT_FOUND,
+            status.HTTP_422_UNPROCESSABLE_CONTENT,
         ]
 
-        for injection in sql_injection_attempts:
-            mock_get_user.return_value = None
-            response = client.post(
-                "/api/v1/auth/login",
-                data={"username": injection, "password": "password"},
-            )
-            # Should not cause errors, just return user not found
-            assert response.status_code in [
-                status.HTTP_404_NOT_FOUND,
-                status.HTTP_422_UNPROCESSABLE_CONTENT,
-            ]
-
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_xss_in_registration(self, mock_user_exists, client):
+    @pytest.mark.parametrize("payload", XSS_PAYLOADS)
+    def test_xss_in_registration(self, test_user_data, client, payload):
         """Test XSS attempts in registration fields."""
-        mock_user_exists.return_value = False
-
-        xss_payloads = [
-            "<script>alert('XSS')</script>",
-            "<img src=x onerror=alert('XSS')>",
-            "javascript:alert('XSS')",
-        ]
-
-        for payload in xss_payloads:
-            response = client.post(
-                "/api/v1/auth/register",
-                json={
-                    "username": payload,
-                    "email": "test@example.com",
-                    "password": "SecurePass123!",
-                    "first_name": "Test",
-                    "last_name": "User",
-                },
-            )
-            # Should be handled by validation
-            assert response.status_code in [
-                status.HTTP_422_UNPROCESSABLE_CONTENT,
-                status.HTTP_400_BAD_REQUEST,
-            ]
-
-    def test_token_tampering(self, created_user):
-        """Test that tampered tokens are rejected."""
-        valid_token = JWTHandler.create_access_token(
-            user_data={
-                "username": created_user.username,
-                "email": created_user.email,
-                "uid": str(created_user.uid),
-            }
-        )
-
-        # Tamper with the token
-        parts = valid_token.split(".")
-        tampered_payload = parts[1][:-3] + "XXX"  # Modify payload
-        tampered_token = f"{parts[0]}.{tampered_payload}.{parts[2]}"
-
-        decoded = JWTHandler.decode_token(tampered_token)
-        assert decoded is None
-
-    def test_token_signature_tampering(self, created_user):
-        """Test that tokens with modified signatures are rejected."""
-        valid_token = JWTHandler.create_access_token(
-            user_data={
-                "username": created_user.username,
-                "email": created_user.email,
-                "uid": str(created_user.uid),
-            }
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                **test_user_data,
+                "username": payload,
+            },
         )
+        # Should be handled by validation
+        assert response.status_code in [
+            status.HTTP_422_UNPROCESSABLE_CONTENT,
+            status.HTTP_400_BAD_REQUEST,
+        ]
 
-        # Tamper with the signature
-        parts = valid_token.split(".")
-        tampered_signature = parts[2][:-3] + "XXX"
-        tampered_token = f"{parts[0]}.{parts[1]}.{tampered_signature}"
+    @pytest.mark.parametrize("segment", [1, 2], ids=["payload", "signature"])
+    def test_token_tampering(self, token_parts, segment):
+        """Test that tokens with a modified payload or signature are rejected."""
+        # Tamper with one segment of the token
+        parts = list(token_parts)
+        parts[segment] = parts[segment][:-3] + "XXX"
+        tampered_token = ".".join(parts)
 
         decoded = JWTHandler.decode_token(tampered_token)
         assert decoded is None
@@ -115,48 +117,43 @@ class TestSecurityVulnerabilities:
 class TestPasswordSecurity:
     """Test password security requirements."""
 
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_weak_passwords_rejected(self, mock_user_exists, client):
+    @pytest.mark.parametrize("weak_pass", WEAK_PASSWORDS)
+    def test_weak_passwords_rejected(self, test_user_data, client, weak_pass):
         """Test that weak passwords are rejected during registration."""
-        mock_user_exists.return_value = False
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                **test_user_data,
+                "password": weak_pass,
+            },
+        )
+        # Assuming password validation is implemented
+        # Adjust based on your validation logic
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
 
-        weak_passwords = [
-            "123456",  # Too simple
-            "password",  # Common word
-            "abc",  # Too short
-            "        ",  # Only spaces
-        ]
+    def test_production_hash_parameters(self):
+        """Test that the real password context hashes at production cost."""
+        # conftest swaps in a cheap context for the session; pwd_context was
+        # imported at collection time, so this is the production one
+        hashed = production_pwd_context.hash("SecurePassword123!")
 
-        for weak_pass in weak_passwords:
-            response = client.post(
-                "/api/v1/auth/register",
-                json={
-                    "username": "testuser",
-                    "email": "test@example.com",
-                    "password": weak_pass,
-                    "first_name": "Test",
-                    "last_name": "User",
-                },
-            )
-            # Assuming password validation is implemented
-            # Adjust based on your validation logic
-            assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+        assert hashed.startswith("$argon2id$")
+        assert "m=65536,t=3,p=2" in hashed
+        assert production_pwd_context.verify("SecurePassword123!", hashed)
 
-    def test_password_hashing(self):
+    def test_password_hashing(self, test_user_data, hashed_test_password):
         """Test that passwords are properly hashed."""
-        password = "SecurePassword123!"
+        password = test_user_data["password"]
         hashed = get_password_hash(password)
 
         # Hash should be different from original
         assert hashed != password
 
-        # Hash should be consistent for same password
-        hashed2 = get_password_hash(password)
-        assert hashed != hashed2  # bcrypt adds salt
+        # Same password hashes differently each time; compare against the
+        # session's hash of it rather than paying for a second one
+        assert hashed != hashed_test_password  # argon2 adds salt
 
         # Hash should be verifiable
-        from app.core.security import verify_password
-
         assert verify_password(password, hashed)
         assert not verify_password("WrongPassword", hashed)
 
@@ -164,36 +161,41 @@ class TestPasswordSecurity:
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_register_with_very_long_fields(self, mock_user_exists, client):
-        """Test registration with extremely long field values."""
-        mock_user_exists.return_value = False
-
-        response = client.post(
-            "/api/v1/auth/register",
-            json={
-                "username": "a" * 1000,  # Very long username
-                "email": "test@example.com",
-                "password": "SecurePass123!",
-                "first_name": "Test",
-                "last_name": "User",
-            },
-        )
-
-        # Should be rejected due to length validation
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
-
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_register_with_unicode_characters(self, mock_user_exists, client):
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            pytest.param(
+                {"username": "a" * 1000},  # Very long username
+                id="very-long-fields",
+            ),
+            pytest.param(
+                {
+                    "username": "",
+                    "email": "",
+                    "password": "",
+                    "first_name": "",
+                    "last_name": "",
+                },
+                id="empty-strings",
+            ),
+            pytest.param(
+                {"username": "   ", "first_name": "   ", "last_name": "   "},
+                id="whitespace-only",
+            ),
+        ],
+    )
+    def test_register_invalid_fields(self, test_user_data, overrides):
+        """Test registration with empty, blank and over-length fields."""
+        with pytest.raises(ValidationError):
+            PublicUserCreate(**{**test_user_data, **overrides})
+
+    def test_register_with_unicode_characters(self, test_user_data, client):
         """Test registration with unicode characters."""
-        mock_user_exists.return_value = False
-
         response = client.post(
             "/api/v1/auth/register",
             json={
+                **test_user_data,
                 "username": "用户名",  # Chinese characters
-                "email": "test@example.com",
-                "password": "SecurePass123!",
                 "first_name": "名字",
                 "last_name": "姓氏",
             },
@@ -205,42 +207,6 @@ class TestEdgeCases:
             status.HTTP_422_UNPROCESSABLE_CONTENT,
         ]
 
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_register_with_empty_strings(self, mock_user_exists, client):
-        """Test registration with empty strings."""
-        mock_user_exists.return_value = False
-
-        response = client.post(
-            "/api/v1/auth/register",
-            json={
-                "username": "",
-                "email": "",
-                "password": "",
-                "first_name": "",
-                "last_name": "",
-            },
-        )
-
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
-
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_register_with_whitespace_only(self, mock_user_exists, client):
-        """Test registration with whitespace-only fields."""
-        mock_user_exists.return_value = False
-
-        response = client.post(
-            "/api/v1/auth/register",
-            json={
-                "username": "   ",
-                "email": "test@example.com",
-                "password": "SecurePass123!",
-                "first_name": "   ",
-                "last_name": "   ",
-            },
-        )
-
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
-
     def test_login_with_null_values(self, client):
         """Test login with null/None values."""
         response = client.post(
@@ -260,58 +226,54 @@ class TestEdgeCases:
 class TestConcurrency:
     """Test concurrent request handling."""
 
-    @pytest.mark.asyncio
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    @patch("app.api.v1.https.auth.auth_crud.create_user", new_callable=AsyncMock)
     async def test_concurrent_registrations(
-        self, mock_create_user, mock_user_exists, client, created_user
+        self, test_user_data, auth_mocks, async_client, created_user
     ):
         """Test multiple simultaneous registration attempts."""
-        mock_user_exists.return_value = False
-        mock_create_user.return_value = created_user
-
-        # Simulate concurrent registration attempts
-        async def register():
-            return client.post(
-                "/api/v1/auth/register",
-                json={
-                    "username": f"user_{uuid4()}",
-                    "email": f"test_{uuid4()}@example.com",
-                    "password": "SecurePass123!",
-                    "first_name": "Test",
-                    "last_name": "User",
-                },
-            )
-
-        # Run 10 concurrent requests
-        tasks = [register() for _ in range(10)]
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # All should either succeed or be rate limited
-        for response in responses:
-            if isinstance(response, BaseException):
-                continue
-            else:
+        auth_mocks.create_user.return_value = created_user
+
+        # Generate the ids up front so the requests only contend on the app
+        ids = [(uuid4(), uuid4()) for _ in range(10)]
+
+        # Concurrent registration attempts; the async client lets them
+        # overlap on the event loop, bounded so hashing can't swamp the CPU
+        sem = asyncio.Semaphore(os.cpu_count() or 4)
+
+        async def register(i):
+            username_id, email_id = ids[i]
+            async with sem:
+                return await async_client.post(
+                    "/api/v1/auth/register",
+                    json={
+                        **test_user_data,
+                        "username": f"user_{username_id}",
+                        "email": f"test_{email_id}@example.com",
+                    },
+                )
+
+        # Run 10 concurrent requests; all should either succeed or be rate
+        # limited, and the first one that doesn't fails the test straight away
+        tasks = [asyncio.create_task(register(i)) for i in range(10)]
+        try:
+            for next_response in asyncio.as_completed(tasks):
+                response = await next_response
                 assert response.status_code in [
                     status.HTTP_201_CREATED,
                     status.HTTP_429_TOO_MANY_REQUESTS,
                 ]
+        finally:
+            # Don't leave requests running past a failed assertion
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
 
 class TestTokenLifecycle:
     """Test token creation, validation, and expiration."""
 
-    def test_access_token_expiration_time(self, created_user):
+    def test_access_token_expiration_time(self, access_token):
         """Test that access tokens have correct expiration time."""
-        token = JWTHandler.create_access_token(
-            user_data={
-                "username": created_user.username,
-                "email": created_user.email,
-                "uid": str(created_user.uid),
-            }
-        )
-
-        decoded = JWTHandler.decode_token(token)
+        decoded = JWTHandler.decode_token(access_token)
         assert decoded is not None
 
         exp_time = datetime.fromtimestamp(decoded["exp"], tz=timezone.utc)
@@ -324,17 +286,8 @@ class TestTokenLifecycle:
         assert time_diff.total_seconds() < 8 * 24 * 3600  # Less than 8 days
         assert time_diff.total_seconds() > 6 * 24 * 3600  # More than 6 days
 
-    def test_refresh_token_expiration_time(self, created_user):
+    def test_refresh_token_expiration_time(self, refresh_token):
         """Test that refresh tokens have longer expiration time."""
-        refresh_token = JWTHandler.create_access_token(
-            user_data={
-                "username": created_user.username,
-                "email": created_user.email,
-                "uid": str(created_user.uid),
-            },
-            refresh=True,
-        )
-
         decoded = JWTHandler.decode_token(refresh_token)
         assert decoded is not None
 
@@ -350,68 +303,50 @@ class TestTokenLifecycle:
 class TestEmailValidation:
     """Test email validation edge cases."""
 
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_invalid_email_formats(self, mock_user_exists, client):
+    @pytest.mark.parametrize("invalid_email", INVALID_EMAILS)
+    def test_invalid_email_formats(self, test_user_data, invalid_email):
         """Test various invalid email formats."""
-        mock_user_exists.return_value = False
-
-        invalid_emails = [
-            "notanemail",
-            "@example.com",
-            "user@",
-            "user @example.com",  # Space in email
-            "user..name@example.com",  # Double dots
-            "user@example",  # No TLD
-            "user@.com",  # Missing domain
-        ]
+        # Validation fails before the route body runs, so check the schema
+        with pytest.raises(ValidationError):
+            PublicUserCreate(**{**test_user_data, "email": invalid_email})
 
-        for invalid_email in invalid_emails:
-            response = client.post(
-                "/api/v1/auth/register",
-                json={
-                    "username": "testuser",
-                    "email": invalid_email,
-                    "password": "SecurePass123!",
-                    "first_name": "Test",
-                    "last_name": "User",
-                },
-            )
-            assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    def test_invalid_email_rejected_by_register(self, test_user_data, client):
+        """Test that the register endpoint surfaces email validation errors."""
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                **test_user_data,
+                "email": INVALID_EMAILS[0],
+            },
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
 
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    @patch("app.api.v1.https.auth.auth_crud.create_user", new_callable=AsyncMock)
     def test_case_insensitive_email(
-        self, mock_create_user, mock_user_exists, client, created_user
+        self, test_user_data, auth_mocks, client, created_user
     ):
         """Test that emails are treated case-insensitively."""
-        mock_user_exists.return_value = False
-        mock_create_user.return_value = created_user
+        auth_mocks.create_user.return_value = created_user
 
         # Register with uppercase email
         response1 = client.post(
             "/api/v1/auth/register",
             json={
+                **test_user_data,
                 "username": "testuser1",
                 "email": "TEST@EXAMPLE.COM",
-                "password": "SecurePass123!",
-                "first_name": "Test",
-                "last_name": "User",
             },
         )
 
         assert response1.status_code == status.HTTP_201_CREATED
 
         # Try to register with same email in lowercase
-        mock_user_exists.return_value = True  # Should detect duplicate
+        auth_mocks.user_exists.return_value = True  # Should detect duplicate
 
         response2 = client.post(
             "/api/v1/auth/register",
             json={
+                **test_user_data,
                 "username": "testuser2",
-                "email": "test@example.com",
-                "password": "SecurePass123!",
-                "first_name": "Test",
-                "last_name": "User",
             },
         )
 
@@ -422,28 +357,26 @@ class TestEmailValidation:
 class TestErrorMessages:
     """Test that error messages are informative but not revealing."""
 
-    @patch("app.api.v1.https.auth.auth_crud.get_user_for_auth", new_callable=AsyncMock)
-    def test_login_error_doesnt_reveal_user_existence(self, mock_get_user, client):
+    def test_login_error_doesnt_reveal_user_existence(
+        self, auth_mocks, client, hashed_correctpassword
+    ):
         """Test that login errors don't reveal whether user exists."""
         # Non-existent user
-        mock_get_user.return_value = None
         response1 = client.post(
             "/api/v1/auth/login",
             data={"username": "nonexistent", "password": "password"},
         )
 
         # Wrong password
-        from app.models.users import User
-
         mock_user = User(
             uid=uuid4(),
             username="existinguser",
             email="existing@example.com",
-            password_hash=get_password_hash("correctpassword"),
+            password_hash=hashed_correctpassword,
             is_active=True,
             is_verified=True,
         )
-        mock_get_user.return_value = mock_user
+        auth_mocks.get_user_for_auth.return_value = mock_user
 
         response2 = client.post(
             "/api/v1/auth/login",
@@ -466,19 +399,15 @@ class TestErrorMessages:
 class TestDataSanitization:
     """Test input data sanitization."""
 
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_username_trimming(self, mock_user_exists, client):
+    def test_username_trimming(self, test_user_data, auth_mocks, client, created_user):
         """Test that usernames are trimmed of whitespace."""
-        mock_user_exists.return_value = False
+        auth_mocks.create_user.return_value = created_user
 
         response = client.post(
             "/api/v1/auth/register",
             json={
+                **test_user_data,
                 "username": "  testuser  ",  # Leading/trailing spaces
-                "email": "test@example.com",
-                "password": "SecurePass123!",
-                "first_name": "Test",
-                "last_name": "User",
             },
         )
 
@@ -488,19 +417,17 @@ class TestDataSanitization:
             status.HTTP_422_UNPROCESSABLE_CONTENT,
         ]
 
-    @patch("app.api.v1.https.auth.auth_crud.user_exists", new_callable=AsyncMock)
-    def test_email_trimming_and_lowercase(self, mock_user_exists, client):
+    def test_email_trimming_and_lowercase(
+        self, test_user_data, auth_mocks, client, created_user
+    ):
         """Test that emails are trimmed and lowercased."""
-        mock_user_exists.return_value = False
+        auth_mocks.create_user.return_value = created_user
 
         response = client.post(
             "/api/v1/auth/register",
             json={
-                "username": "testuser",
+                **test_user_data,
                 "email": "  TEST@EXAMPLE.COM  ",  # Spaces and uppercase
-                "password": "SecurePass123!",
-                "first_name": "Test",
-                "last_name": "User",
             },
         )
 
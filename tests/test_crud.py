@@ -0,0 +1,140 @@
+"""
+Tests for the CRUD layer against the test database.
+
+These tests cover:
+- User existence checks
+- Live stream listing
+- Eager loading of stream owners
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import inspect
+
+from app.crud.streams import StreamCrud
+from app.crud.users import UserCRUD
+from app.models.streams import Stream
+from app.schemas.streams import StreamPublicResponse
+
+
+@pytest.fixture
+async def stored_user(session, created_user):
+    """created_user committed to the test DB."""
+    session.add(created_user)
+    await session.commit()
+    return created_user
+
+
+class TestUserCRUD:
+    """Test UserCRUD queries."""
+
+    @pytest.mark.parametrize(
+        "username, email, expected",
+        [
+            ("testuser", "someone@example.com", True),
+            ("someone", "test@example.com", True),
+            ("testuser", "test@example.com", True),
+            ("someone", "someone@example.com", False),
+        ],
+        ids=["username-match", "email-match", "both-match", "no-match"],
+    )
+    async def test_user_exists(self, session, stored_user, username, email, expected):
+        """Test the shared existence statement with different bound values."""
+        assert await UserCRUD().user_exists(session, username, email) is expected
+
+    async def test_user_exists_reuses_statement(self, session, stored_user):
+        """Test that the module-level statement rebinds cleanly between calls."""
+        crud = UserCRUD()
+
+        assert await crud.user_exists(session, "testuser", "x@example.com")
+        assert not await crud.user_exists(session, "nobody", "x@example.com")
+        assert await crud.user_exists(session, "nobody", "test@example.com")
+
+
+def _stream(user, title, **fields):
+    """An unsaved stream owned by user."""
+    return Stream(
+        title=title,
+        stream_key=Stream.generate_stream_key(),
+        user_id=user.uid,
+        **fields,
+    )
+
+
+class TestStreamCrud:
+    """Test StreamCrud queries."""
+
+    async def test_get_live_streams(self, session, stored_user):
+        """Test that only live public streams are listed, busiest first."""
+        started_at = datetime.now(timezone.utc)
+        session.add_all(
+            [
+                _stream(
+                    stored_user,
+                    "Quiet",
+                    is_live=True,
+                    current_viewers=5,
+                    started_at=started_at,
+                ),
+                _stream(
+                    stored_user,
+                    "Busy",
+                    is_live=True,
+                    current_viewers=20,
+                    total_views=100,
+                    description="Busy stream",
+                    category="gaming",
+                    thumbnail_url="http://example.com/thumb.png",
+                    hls_url="http://example.com/hls/index.m3u8",
+                    started_at=started_at,
+                ),
+                _stream(stored_user, "Private", is_live=True, is_private=True),
+                _stream(stored_user, "Offline", current_viewers=50),
+            ]
+        )
+        await session.commit()
+
+        streams = await StreamCrud.get_live_streams(session)
+
+        assert [stream.title for stream in streams] == ["Busy", "Quiet"]
+        busy = streams[0]
+        assert isinstance(busy, StreamPublicResponse)
+        # model_construct skips validation, so check every field was selected
+        # and that the values would pass it
+        assert busy.model_fields_set == set(StreamPublicResponse.model_fields)
+        assert StreamPublicResponse.model_validate(busy.model_dump()) == busy
+        assert busy.user_id == stored_user.uid
+        assert busy.current_viewers == 20
+        assert busy.total_views == 100
+        assert busy.category == "gaming"
+        assert busy.started_at is not None
+
+    async def test_get_live_streams_paginates(self, session, stored_user):
+        """Test that skip and limit apply after ordering."""
+        session.add_all(
+            [
+                _stream(stored_user, f"Stream {n}", is_live=True, current_viewers=n)
+                for n in range(5)
+            ]
+        )
+        await session.commit()
+
+        streams = await StreamCrud.get_live_streams(session, skip=1, limit=2)
+
+        assert [stream.current_viewers for stream in streams] == [3, 2]
+
+    async def test_get_streams_by_user_loads_owner(self, session, stored_user):
+        """Test that stream.user is loaded up front, not lazily."""
+        session.add_all([_stream(stored_user, "First"), _stream(stored_user, "Second")])
+        await session.commit()
+        # Start from an empty identity map so the owner can't come from it
+        session.expunge_all()
+
+        streams = await StreamCrud.get_streams_by_user(session, stored_user.uid)
+
+        assert len(streams) == 2
+        for stream in streams:
+            assert "user" not in inspect(stream).unloaded
+            # A lazy load here would raise MissingGreenlet on AsyncSession
+            assert stream.user.username == stored_user.username
@@ -0,0 +1,57 @@
+"""
+Tests for the application lifespan.
+
+These tests cover:
+- Redis and rate limiter setup on startup
+- Connection cleanup on shutdown
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import FastAPI
+
+from app.core.redis_rate_limiter import RedisTokenBucketRateLimiter
+from app.main import lifespan
+
+
+class TestLifespan:
+    """Test startup and shutdown of the application lifespan."""
+
+    async def test_lifespan_opens_and_closes_connections(self):
+        """Test that shutdown closes Redis and disposes the DB engine."""
+        redis_client = MagicMock(ping=AsyncMock(), aclose=AsyncMock())
+        app = FastAPI()
+
+        with (
+            patch("app.main.redis.Redis.from_pool", return_value=redis_client),
+            patch("app.main.async_engine") as mock_engine,
+        ):
+            mock_engine.dispose = AsyncMock()
+
+            async with lifespan(app):
+                assert app.state.redis is redis_client
+                assert isinstance(app.state.rate_limiter, RedisTokenBucketRateLimiter)
+                redis_client.aclose.assert_not_awaited()
+                mock_engine.dispose.assert_not_awaited()
+
+        redis_client.aclose.assert_awaited_once()
+        mock_engine.dispose.assert_awaited_once()
+
+    async def test_lifespan_survives_redis_errors(self):
+        """Test that an unreachable Redis doesn't block startup or shutdown."""
+        redis_client = MagicMock(
+            ping=AsyncMock(side_effect=ConnectionError("refused")),
+            aclose=AsyncMock(side_effect=ConnectionError("refused")),
+        )
+        app = FastAPI()
+
+        with (
+            patch("app.main.redis.Redis.from_pool", return_value=redis_client),
+            patch("app.main.async_engine") as mock_engine,
+        ):
+            mock_engine.dispose = AsyncMock()
+
+            async with lifespan(app):
+                pass
+
+        mock_engine.dispose.assert_awaited_once()
@@ -0,0 +1,160 @@
+"""
+Tests for the user schemas.
+
+These tests cover:
+- Building read models from DB rows
+- Readable validation messages
+- Email validation on input and output models
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.users import PublicUserCreate, UserRead, UserReadWithToken, UserUpdate
+
+
+class TestUserRead:
+    """Test building UserRead models from DB rows."""
+
+    @pytest.mark.parametrize("schema", [UserRead, UserReadWithToken])
+    def test_from_orm_fast_matches_model_validate(self, schema, created_user):
+        """Test that the unvalidated fast path builds the same model."""
+        fast = schema.from_orm_fast(created_user)
+        validated = schema.model_validate(created_user, from_attributes=True)
+
+        assert fast == validated
+        assert fast.model_dump() == validated.model_dump()
+
+
+class TestValidationMessages:
+    """Test that field errors read well and don't echo internal regexes."""
+
+    @pytest.mark.parametrize(
+        "field, value, message",
+        [
+            (
+                "username",
+                "bad name!",
+                "Username can only contain letters, numbers, hyphens, and underscores",
+            ),
+            ("first_name", "R2-D2", "Name contains invalid characters"),
+            ("last_name", "<b>", "Name contains invalid characters"),
+        ],
+    )
+    def test_pattern_mismatch_message(self, test_user_data, field, value, message):
+        """Test that pattern mismatches carry the friendly message."""
+        with pytest.raises(ValidationError) as exc_info:
+            PublicUserCreate(**{**test_user_data, field: value})
+
+        [error] = exc_info.value.errors()
+        assert error["loc"] == (field,)
+        assert error["msg"] == message
+
+    def test_update_name_message(self):
+        """Test that UserUpdate shares the name message."""
+        with pytest.raises(ValidationError) as exc_info:
+            UserUpdate(first_name="R2-D2")
+
+        assert exc_info.value.errors()[0]["msg"] == "Name contains invalid characters"
+
+    def test_length_checked_after_trimming(self, test_user_data):
+        """Test that length errors see the trimmed value and read as strings."""
+        with pytest.raises(ValidationError) as exc_info:
+            PublicUserCreate(**{**test_user_data, "username": "  ab  "})
+
+        [error] = exc_info.value.errors()
+        assert error["type"] == "string_too_short"
+
+    def test_fields_are_trimmed(self, test_user_data):
+        """Test that surrounding whitespace is stripped from valid values."""
+        user = PublicUserCreate(
+            **{**test_user_data, "username": "  testuser ", "first_name": " Ann "}
+        )
+
+        assert user.username == "testuser"
+        assert user.first_name == "Ann"
+
+
+class TestEmail:
+    """Test the lenient input pattern and EmailStr on output models."""
+
+    @pytest.mark.parametrize(
+        "email", ["o'neil@example.com", "jose@exämple.com", "first.last+tag@a.co.uk"]
+    )
+    def test_valid_emails_accepted(self, test_user_data, email):
+        """Test that apostrophes, IDN domains and sub-addresses are accepted."""
+        user = PublicUserCreate(**{**test_user_data, "email": email})
+
+        assert user.email == email
+
+    def test_email_normalised(self, test_user_data):
+        """Test that input emails are trimmed and lowercased."""
+        user = PublicUserCreate(**{**test_user_data, "email": "  O'Neil@Example.COM "})
+
+        assert user.email == "o'neil@example.com"
+
+    def test_invalid_email_message(self, test_user_data):
+        """Test that a malformed email doesn't echo the pattern back."""
+        with pytest.raises(ValidationError) as exc_info:
+            PublicUserCreate(**{**test_user_data, "email": "user..name@example.com"})
+
+        [error] = exc_info.value.errors()
+        assert error["msg"] == "Invalid email format"
+
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "probe@foo.test",
+            "printer@office.local",
+            "nobody@example.invalid",
+            "dev@localhost.localhost",
+            "user@" + "a" * 64 + ".com",
+        ],
+        ids=["test", "local", "invalid", "localhost", "long-label"],
+    )
+    def test_emails_rejected_by_email_validator(self, test_user_data, email):
+        """Test that addresses EmailStr refuses are refused on input too."""
+        with pytest.raises(ValidationError):
+            PublicUserCreate(**{**test_user_data, "email": email})
+
+    def test_punycode_tld_accepted(self, test_user_data):
+        """Test that punycode TLDs pass the pattern pre-filter."""
+        user = PublicUserCreate(**{**test_user_data, "email": "x@example.xn--p1ai"})
+
+        assert user.email == "x@example.рф"
+
+    def test_accepted_emails_build_user_read(self, test_user_data, created_user):
+        """Test that any email accepted on input also validates in UserRead."""
+        candidates = [
+            "o'neil@example.com",
+            "jose@exämple.com",
+            "first.last+tag@a.co.uk",
+            "x@example.xn--p1ai",
+            "probe@foo.test",
+            "user@" + "a" * 64 + ".com",
+            "a@b.c",
+            "a@b.co",
+        ]
+        accepted = 0
+        for email in candidates:
+            try:
+                user_in = PublicUserCreate(**{**test_user_data, "email": email})
+            except ValidationError:
+                continue  # Rejected on input, so it can never be stored
+
+            created_user.email = user_in.email
+            user = UserRead.model_validate(created_user, from_attributes=True)
+            assert user.email == user_in.email, email
+            accepted += 1
+
+        assert accepted == 5
+
+    def test_user_read_round_trips_apostrophe_email(self, created_user):
+        """Test that a stored apostrophe address survives response validation."""
+        created_user.email = "o'neil@example.com"
+
+        user = UserRead.model_validate(created_user, from_attributes=True)
+        round_tripped = UserRead.model_validate_json(user.model_dump_json())
+
+        assert round_tripped.email == "o'neil@example.com"
+        assert round_tripped == user
@@ -0,0 +1,108 @@
+"""
+Tests for the stream service.
+
+These tests cover:
+- Starting and stopping streams
+- Not-found and wrong-state errors
+- Viewer and view counters
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import ResourceNotFoundException, ValidationException
+from app.models.streams import Stream
+from app.services.streams import StreamService
+
+
+@pytest.fixture
+async def stream(session, created_user):
+    """An offline stream owned by created_user, committed to the test DB."""
+    session.add(created_user)
+    stream = Stream(
+        title="Test Stream",
+        stream_key=Stream.generate_stream_key(),
+        user_id=created_user.uid,
+    )
+    session.add(stream)
+    await session.commit()
+    return stream
+
+
+class TestStreamLifecycle:
+    """Test start/stop transitions and their errors."""
+
+    async def test_start_stream(self, session, stream):
+        """Test that starting an offline stream marks it live."""
+        started = await StreamService.start_stream(session, stream.sid, stream.user_id)
+
+        assert started.is_live is True
+        assert started.started_at is not None
+        assert started.ended_at is None
+        assert started.current_viewers == 0
+
+    async def test_start_stream_already_live(self, session, stream):
+        """Test that starting a live stream is rejected."""
+        await StreamService.start_stream(session, stream.sid, stream.user_id)
+
+        with pytest.raises(ValidationException, match="already live"):
+            await StreamService.start_stream(session, stream.sid, stream.user_id)
+
+    async def test_stop_stream(self, session, stream):
+        """Test that stopping a live stream takes it offline."""
+        await StreamService.start_stream(session, stream.sid, stream.user_id)
+        stopped = await StreamService.stop_stream(session, stream.sid, stream.user_id)
+
+        assert stopped.is_live is False
+        assert stopped.ended_at is not None
+
+    async def test_stop_stream_not_live(self, session, stream):
+        """Test that stopping an offline stream is rejected."""
+        with pytest.raises(ValidationException, match="not live"):
+            await StreamService.stop_stream(session, stream.sid, stream.user_id)
+
+    @pytest.mark.parametrize(
+        "action", [StreamService.start_stream, StreamService.stop_stream]
+    )
+    async def test_unknown_stream(self, session, stream, action):
+        """Test that an unknown sid is a 404, not a state error."""
+        with pytest.raises(ResourceNotFoundException):
+            await action(session, uuid4(), stream.user_id)
+
+    async def test_other_users_stream(self, session, stream):
+        """Test that another user's stream is reported as not found."""
+        with pytest.raises(ResourceNotFoundException):
+            await StreamService.start_stream(session, stream.sid, uuid4())
+
+    async def test_start_stream_refreshes_loaded_instance(self, session, stream):
+        """Test that the UPDATE ... RETURNING refreshes the session's copy."""
+        loaded = await session.get(Stream, stream.sid)
+        assert loaded.is_live is False
+
+        started = await StreamService.start_stream(session, stream.sid, stream.user_id)
+
+        assert started is loaded
+        assert loaded.is_live is True
+        assert loaded.started_at is not None
+
+
+class TestStreamCounters:
+    """Test the in-SQL viewer and view counters."""
+
+    async def test_peak_viewers_rises_but_never_falls(self, session, stream):
+        """Test that peak_viewers tracks the highest viewer count seen."""
+        for viewers, expected_peak in [(5, 5), (12, 12), (3, 12), (12, 12), (20, 20)]:
+            await StreamService.update_viewer_count(session, stream.sid, viewers)
+            await session.refresh(stream)
+
+            assert stream.current_viewers == viewers
+            assert stream.peak_viewers == expected_peak
+
+    async def test_increment_total_views(self, session, stream):
+        """Test that each call adds exactly one view."""
+        for _ in range(3):
+            await StreamService.increment_total_views(session, stream.sid)
+
+        await session.refresh(stream)
+        assert stream.total_views == 3